@@ -114,3 +114,39 @@ def clear_neo4j_data() -> Dict[str, Any]:
         return data_removed
 
     return tool_success("message", "Neo4j graph has been reset.")
+
+async def adrop_neo4j_indexes(driver) -> Dict[str, Any]:
+    """Async version of drop_neo4j_indexes, run on the given async driver.
+
+    Returns:
+        Success or an error.
+    """
+    list_constraints = await graphdb.asend_query(driver, """SHOW CONSTRAINTS YIELD name""")
+    if (list_constraints["status"] == "error"):
+        return list_constraints
+    for row in list_constraints["query_result"]:
+        dropped_constraint = await graphdb.asend_query(driver, """DROP CONSTRAINT $constraint_name""", {"constraint_name": row["name"]})
+        if (dropped_constraint["status"] == "error"):
+            return dropped_constraint
+
+    list_indexes = await graphdb.asend_query(driver, """SHOW INDEXES YIELD name""")
+    if (list_indexes["status"] == "error"):
+        return list_indexes
+    for row in list_indexes["query_result"]:
+        dropped_index = await graphdb.asend_query(driver, """DROP INDEX $index_name""", {"index_name": row["name"]})
+        if (dropped_index["status"] == "error"):
+            return dropped_index
+
+    return tool_success("message", "Neo4j constraints and indexes have been dropped.")
+
+async def aclear_neo4j_data(driver) -> Dict[str, Any]:
+    """Async version of clear_neo4j_data, run on the given async driver.
+
+    Returns:
+        Success or an error.
+    """
+    data_removed = await graphdb.asend_query(driver, """MATCH (n) CALL (n) { DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS""")
+    if (data_removed["status"] == "error") :
+        return data_removed
+
+    return tool_success("message", "Neo4j graph has been reset.")
@@ -7,6 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from itertools import islice
 from typing import Dict, Any, List, Tuple
 from src.neo4j_for_adk import graphdb
 from Levenshtein import jaro_winkler
@@ -18,10 +19,11 @@ class AutomatedLinkageAgent:
     Automated version - no human intervention required.
     """
 
-    def __init__(self, similarity_threshold: float = 0.6):
+    def __init__(self, similarity_threshold: float = 0.6, batch_size: int = 5000):
         self.name = "AutomatedLinkageAgent"
         self.description = "Automatically links entities across graphs using similarity matching"
         self.similarity_threshold = similarity_threshold
+        self.batch_size = batch_size
 
     def calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate Jaro-Winkler similarity between two strings."""
@@ -128,7 +130,21 @@ class AutomatedLinkageAgent:
             "score": similarity_score
         })
 
-    def resolve_entities_for_type(self, entity_type: str) -> Dict[str, Any]:
+    def create_correspondences(self, pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create CORRESPONDS_TO relationships for a batch of matched entity pairs."""
+
+        query = """
+        UNWIND $pairs AS pair
+        MATCH (subject) WHERE id(subject) = pair.subject_id
+        MATCH (domain) WHERE id(domain) = pair.domain_id
+        MERGE (subject)-[r:CORRESPONDS_TO]->(domain)
+        SET r.similarity = pair.score
+        RETURN count(r) as created
+        """
+
+        return graphdb.send_query(query, {"pairs": pairs})
+
+    def resolve_entities_for_type(self, entity_type: str, batch_size: int = None) -> Dict[str, Any]:
         """Resolve all entities of a specific type."""
 
         print(f"  🔗 Resolving {entity_type} entities...")
@@ -158,10 +174,10 @@ class AutomatedLinkageAgent:
         # Match field based on entity type
         match_field = "product" if entity_type == "Product" else "name"
 
-        # Resolve each subject entity
+        # Match each subject entity, then write the correspondences in batches
+        pairs = []
         for subject_entity in subject_entities:
             try:
-                # Find best match
                 best_match, score = self.find_best_match(
                     subject_entity,
                     domain_entities,
@@ -169,18 +185,11 @@ class AutomatedLinkageAgent:
                 )
 
                 if best_match and score >= self.similarity_threshold:
-                    # Create correspondence relationship
-                    result = self.create_correspondence(
-                        subject_entity['n'].id,
-                        best_match['n'].id,
-                        score
-                    )
-
-                    if result['status'] == 'success':
-                        results["resolved"] += 1
-                    else:
-                        results["unresolved"] += 1
-                        results["errors"].append(result.get('error_message', 'Unknown error'))
+                    pairs.append({
+                        "subject_id": subject_entity['n'].id,
+                        "domain_id": best_match['n'].id,
+                        "score": score
+                    })
                 else:
                     results["unresolved"] += 1
 
@@ -188,13 +197,25 @@ class AutomatedLinkageAgent:
                 results["unresolved"] += 1
                 results["errors"].append(str(e))
 
+        batch_size = batch_size or self.batch_size
+        remaining = iter(pairs)
+        while batch := list(islice(remaining, batch_size)):
+            result = self.create_correspondences(batch)
+
+            if result['status'] == 'success':
+                results["resolved"] += len(batch)
+            else:
+                results["unresolved"] += len(batch)
+                results["errors"].append(result.get('error_message', 'Unknown error'))
+
         print(f"    ✅ Resolved {results['resolved']} of {len(subject_entities)} {entity_type} entities")
 
         return results
 
     def resolve_all_entities(
         self,
-        entity_types: List[str] = None
+        entity_types: List[str] = None,
+        batch_size: int = None
     ) -> Dict[str, Any]:
         """Resolve entities across all types."""
 
@@ -213,7 +234,7 @@ class AutomatedLinkageAgent:
         }
 
         for entity_type in entity_types:
-            type_results = self.resolve_entities_for_type(entity_type)
+            type_results = self.resolve_entities_for_type(entity_type, batch_size)
 
             overall_results["total_relationships"] += type_results["resolved"]
             overall_results["entities_resolved"][entity_type] = type_results["resolved"]
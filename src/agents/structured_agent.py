@@ -10,6 +10,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from typing import Dict, Any, List
 from src.neo4j_for_adk import graphdb, tool_success, tool_error
 
+# Rows per transaction when loading CSV files. Batches run serially: CSV keys are
+# not guaranteed unique, and concurrent batches merging the same key would race
+# on the uniqueness constraint, while concurrent relationship MERGEs on shared
+# end nodes contend for locks.
+NODE_BATCH_SIZE = 10000
+RELATIONSHIP_BATCH_SIZE = 1000
+
+# Properties also stored lowercased as `<property>_lower`, backed by a text
+# index, so case-insensitive name lookups need not lowercase every node
+LOWERCASE_PROPERTIES = {"Product": ("product_name",)}
+
 
 class AutomatedStructuredAgent:
     """
@@ -30,6 +41,24 @@ class AutomatedStructuredAgent:
 
         return graphdb.send_query(query)
 
+    def create_lookup_index(self, label: str, property_key: str) -> Dict[str, Any]:
+        """Creates a range index for a node label and property key."""
+        index_name = f"{label}_{property_key}_index"
+        query = f"""CREATE INDEX `{index_name}` IF NOT EXISTS
+        FOR (n:`{label}`)
+        ON (n.`{property_key}`)"""
+
+        return graphdb.send_query(query)
+
+    def create_text_index(self, label: str, property_key: str) -> Dict[str, Any]:
+        """Creates a text index for a node label and property key."""
+        index_name = f"{label}_{property_key}_text_index"
+        query = f"""CREATE TEXT INDEX `{index_name}` IF NOT EXISTS
+        FOR (n:`{label}`)
+        ON (n.`{property_key}`)"""
+
+        return graphdb.send_query(query)
+
     def load_nodes_from_csv(
         self,
         source_file: str,
@@ -42,6 +71,9 @@ class AutomatedStructuredAgent:
         set_clauses = []
         for prop in properties:
             set_clauses.append(f"n.`{prop}` = row.`{prop}`")
+        for prop in LOWERCASE_PROPERTIES.get(label, ()):
+            if prop in properties or prop == unique_column_name:
+                set_clauses.append(f"n.`{prop}_lower` = toLower(row.`{prop}`)")
         set_clause = ", ".join(set_clauses) if set_clauses else ""
 
         query = f"""
@@ -49,7 +81,7 @@ class AutomatedStructuredAgent:
         CALL (row) {{
             MERGE (n:`{label}` {{ `{unique_column_name}` : row.`{unique_column_name}` }})
             {"SET " + set_clause if set_clause else ""}
-        }} IN TRANSACTIONS OF 1000 ROWS
+        }} IN TRANSACTIONS OF {NODE_BATCH_SIZE} ROWS
         """
 
         return graphdb.send_query(query, {"source_file": source_file})
@@ -67,6 +99,11 @@ class AutomatedStructuredAgent:
         if uniqueness_result["status"] == "error":
             return uniqueness_result
 
+        for prop in LOWERCASE_PROPERTIES.get(node_construction["label"], ()):
+            index_result = self.create_text_index(node_construction["label"], f"{prop}_lower")
+            if index_result["status"] == "error":
+                return index_result
+
         # Import nodes from CSV
         result = self.load_nodes_from_csv(
             node_construction["source_file"],
@@ -106,7 +143,7 @@ class AutomatedStructuredAgent:
                   (to_node:`{to_node_label}` {{ `{to_node_column}` : row.`{to_node_column}` }})
             MERGE (from_node)-[r:`{relationship_type}`]->(to_node)
             {"SET " + set_clause if set_clause else ""}
-        }} IN TRANSACTIONS OF 1000 ROWS
+        }} IN TRANSACTIONS OF {RELATIONSHIP_BATCH_SIZE} ROWS
         """
 
         result = graphdb.send_query(query, {"source_file": relationship_construction["source_file"]})
@@ -8,11 +8,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 import re
 import json
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from src.neo4j_for_adk import graphdb
+from src.agents.structured_agent import LOWERCASE_PROPERTIES
 from openai import OpenAI
 
+# Keeps the lowercased name copies of Product nodes created from text in step
+# with the ones the structured load writes
+_PRODUCT_LOWERCASE_SET = "".join(
+    f"\n                    SET n.`{prop}_lower` = toLower(n.`{prop}`)"
+    for prop in LOWERCASE_PROPERTIES.get("Product", ())
+)
+
 class DirectUnstructuredAgent:
     """
     Agent for extracting entities from text using direct LLM calls.
@@ -146,7 +155,7 @@ class DirectUnstructuredAgent:
                     # Create new Product node if not found
                     query = f"""
                     MERGE (n:Product {{product_name: $product_name}})
-                    SET n += $properties
+                    SET n += $properties{_PRODUCT_LOWERCASE_SET}
                     RETURN n
                     """
                     result = graphdb.send_query(query, parameters={
@@ -256,9 +265,17 @@ class DirectUnstructuredAgent:
         self,
         file_path: str,
         entity_types: List[str] = None,
-        fact_types: Dict[str, Dict[str, str]] = None
+        fact_types: Dict[str, Dict[str, str]] = None,
+        write_gate: Optional[asyncio.Event] = None,
+        write_lock: Optional[asyncio.Lock] = None
     ) -> Dict[str, Any]:
-        """Process a single markdown file to extract entities and relationships."""
+        """
+        Process a single markdown file to extract entities and relationships.
+
+        If write_gate is given, extraction starts right away but nothing is written
+        to Neo4j until the gate is set (e.g. once the domain graph exists).
+        If write_lock is given, the Neo4j writes are made while holding it.
+        """
         try:
             print(f"    📄 Processing: {os.path.basename(file_path)}")
 
@@ -269,11 +286,20 @@ class DirectUnstructuredAgent:
             # Extract product name from filename
             product_name = self.extract_product_name(file_path)
 
-            # Extract entities using LLM
-            extraction = self.extract_entities_from_text(text, product_name, entity_types, fact_types)
+            # Extract entities using LLM (blocking client, so keep it off the event loop)
+            extraction = await asyncio.to_thread(
+                self.extract_entities_from_text, text, product_name, entity_types, fact_types
+            )
+
+            if write_gate is not None:
+                await write_gate.wait()
 
             # Create nodes and relationships in Neo4j
-            stats = self.create_nodes_and_relationships(extraction, file_path)
+            if write_lock is not None:
+                async with write_lock:
+                    stats = await asyncio.to_thread(self.create_nodes_and_relationships, extraction, file_path)
+            else:
+                stats = await asyncio.to_thread(self.create_nodes_and_relationships, extraction, file_path)
 
             print(f"      ✅ Created {stats['nodes_created']} nodes, {stats['relationships_created']} relationships")
 
@@ -297,9 +323,16 @@ class DirectUnstructuredAgent:
         file_paths: List[str],
         entity_types: List[str],
         fact_types: Dict[str, Dict[str, str]],
-        import_dir: Optional[str] = None
+        import_dir: Optional[str] = None,
+        write_gate: Optional[asyncio.Event] = None,
+        concurrency: int = 8
     ) -> Dict[str, Any]:
-        """Construct the complete subject graph from multiple files."""
+        """
+        Construct the complete subject graph from multiple files.
+
+        Up to `concurrency` files are extracted at once. Their Neo4j writes are
+        serialized, since files can MERGE the same entities and relationships.
+        """
         print("\n📚 Constructing Subject Graph from text files...")
 
         results = {
@@ -312,14 +345,25 @@ class DirectUnstructuredAgent:
 
         print(f"  Processing {len(file_paths)} markdown files...")
 
-        for file_path in file_paths:
+        semaphore = asyncio.Semaphore(concurrency)
+        write_lock = asyncio.Lock()
+
+        async def process_one(file_path: str) -> Dict[str, Any]:
             # Add import_dir if provided
             full_path = os.path.join(import_dir, file_path) if import_dir else file_path
+            async with semaphore:
+                return await self.process_file(full_path, entity_types, fact_types, write_gate, write_lock)
 
-            # Process file
-            result = await self.process_file(full_path, entity_types, fact_types)
+        file_results = await asyncio.gather(
+            *(process_one(file_path) for file_path in file_paths),
+            return_exceptions=True
+        )
 
-            if result["status"] == "success":
+        for file_path, result in zip(file_paths, file_results):
+            if isinstance(result, BaseException):
+                results["files_failed"].append(file_path)
+                results["errors"].append(str(result))
+            elif result["status"] == "success":
                 results["files_processed"].append(file_path)
                 results["total_nodes"] += result.get("nodes_created", 0)
                 results["total_relationships"] += result.get("relationships_created", 0)
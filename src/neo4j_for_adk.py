@@ -6,6 +6,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from neo4j import (
+    AsyncGraphDatabase,
     GraphDatabase,
     Result,
 )
@@ -80,9 +81,14 @@ class Neo4jForADK:
         neo4j_password = os.getenv("NEO4J_PASSWORD")
         neo4j_database = os.getenv("NEO4J_DATABASE") or os.getenv("NEO4J_USERNAME") or "neo4j"
         self.database_name = neo4j_database
+        self._uri = neo4j_uri
+        self._auth = (neo4j_username, neo4j_password)
+        # One driver for the whole process; its connection pool is shared by every
+        # session, so queries reuse connections instead of reconnecting
         self._driver =  GraphDatabase.driver(
             neo4j_uri,
-            auth=(neo4j_username, neo4j_password)
+            auth=(neo4j_username, neo4j_password),
+            max_connection_pool_size=50
         )
     
     def get_driver(self):
@@ -92,12 +98,12 @@ class Neo4jForADK:
         return self._driver.close()
     
     def send_query(self, cypher_query, parameters=None) -> Dict[str, Any]:
-        session = self._driver.session()
+        # Naming the database avoids a home-database lookup per session
+        session = self._driver.session(database=self.database_name)
         try:
             result = session.run(
-                cypher_query, 
-                parameters or {},
-                database_=self.database_name
+                cypher_query,
+                parameters or {}
             )
             return result_to_adk(result)
         except Exception as e:
@@ -105,6 +111,20 @@ class Neo4jForADK:
         finally:
             session.close()
 
+    def create_async_driver(self):
+        """Create an async driver. It is bound to the event loop it is used in, so the caller owns and closes it."""
+        return AsyncGraphDatabase.driver(self._uri, auth=self._auth)
+
+    async def asend_query(self, driver, cypher_query, parameters=None) -> Dict[str, Any]:
+        """Async counterpart of send_query, run on a driver from create_async_driver."""
+        try:
+            async with driver.session(database=self.database_name) as session:
+                result = await session.run(cypher_query, parameters or {})
+                records = [to_python(record.data()) async for record in result]
+            return tool_success("query_result", records)
+        except Exception as e:
+            return tool_error(str(e))
+
     def get_import_directory(self):
         results = self.send_query("""
             Call dbms.listConfig() YIELD name, value
@@ -2,10 +2,28 @@
 Pipeline module for ADK-enhanced knowledge graph construction
 """
 
-from .dynamic_builder import DynamicKnowledgeGraphBuilder
-from .adk_dynamic_builder import ADKDynamicKnowledgeGraphBuilder
+import importlib
+
+# Builders are imported on first access, so using the plain builder does not
+# load google.adk and LiteLlm for the ADK one
+_BUILDER_MODULES = {
+    'DynamicKnowledgeGraphBuilder': '.dynamic_builder',
+    'ADKDynamicKnowledgeGraphBuilder': '.adk_dynamic_builder'
+}
 
 __all__ = [
     'DynamicKnowledgeGraphBuilder',
     'ADKDynamicKnowledgeGraphBuilder'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _BUILDER_MODULES:
+        value = getattr(importlib.import_module(_BUILDER_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
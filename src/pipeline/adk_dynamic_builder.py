@@ -8,12 +8,27 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 import asyncio
+import hashlib
 import json
-from typing import Dict, Any, Optional, List, Tuple
+import re
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 # Import regular pipeline components
-from src.pipeline.dynamic_builder import DynamicKnowledgeGraphBuilder
+from src.pipeline.dynamic_builder import (
+    DynamicKnowledgeGraphBuilder,
+    _cached_per_graph_version,
+    _dumps_json,
+    _write_bytes,
+    _EXECUTION_LOG_SIZE
+)
 
 # Import ADK components
 from google.adk.agents import Agent
@@ -21,127 +36,424 @@ from google.adk.models.lite_llm import LiteLlm
 from notebooks.helper import make_agent_caller
 
 
+_LINE_RE = re.compile(r'[^\n]+')
+
+_MAX_SUGGESTIONS = 5
+
+_ADK_RESULTS_FILE = os.path.join("generated_plans", "adk_pipeline_results.json")
+
+# Score reported when a validator fails or does not answer with JSON; it sits at
+# the warning thresholds used in astream so a failed check never raises an alarm.
+# Results carrying it are marked "parsed": False and are never cached or reused.
+_FALLBACK_SCORE = 75
+
+# The response length is requested in the instructions; the hard max_tokens limit
+# sits well above it so a reply that runs long is not cut off into invalid JSON
+_HARD_LIMIT_FACTOR = 4
+
+
+class _UnparsableResponse(ValueError):
+    """Raised when an agent response is not a JSON object."""
+
+    def __init__(self, response: Any):
+        super().__init__("agent response is not a JSON object")
+        self.response = response
+
+
+def _summarize_for_prompt(data: Any, max_items: int = 20) -> Any:
+    """Recursively keep only the first max_items elements of every list."""
+    if isinstance(data, dict):
+        return {key: _summarize_for_prompt(value, max_items) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_summarize_for_prompt(value, max_items) for value in data[:max_items]]
+    return data
+
+
+def _prompt_json(data: Any) -> str:
+    """Render data as a fenced JSON block for an agent prompt."""
+    summary = _summarize_for_prompt(data)
+    if orjson is not None:
+        text = orjson.dumps(summary, default=str).decode("utf-8")
+    else:
+        text = json.dumps(summary, default=str, ensure_ascii=False)
+    return f"```json\n{text}\n```"
+
+
+def _cache_key(payload: Dict[str, Any]) -> str:
+    """Hash a JSON-serializable payload into a stable cache key."""
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        data = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
 class ADKDynamicKnowledgeGraphBuilder(DynamicKnowledgeGraphBuilder):
     """
     Enhanced pipeline builder using ADK agents for intelligent decision making.
     """
 
-    def __init__(self, data_dir: str = None, llm_model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        data_dir: str = None,
+        llm_model: str = "gpt-4o-mini",
+        llm_timeout: float = 30.0,
+        llm_retries: int = 1,
+        max_response_tokens: int = 200
+    ):
         """Initialize ADK-enhanced builder."""
         super().__init__(data_dir)
         self.llm_model = llm_model
+        self.llm_timeout = llm_timeout
+        self.llm_retries = llm_retries
+        self.max_response_tokens = max_response_tokens
         self.validation_results = {}
+        self.validation_cache_dir = os.path.join("generated_plans", ".validation_cache")
+        self._previous_validation_results = self._load_previous_validation_results()
 
-    async def validate_goal(self, goal: Dict[str, Any]) -> Dict[str, Any]:
-        """Use ADK agent to validate and improve the goal determination."""
+    def _load_previous_validation_results(self) -> Dict[str, Any]:
+        """Load the validation results saved by the last pipeline run, if any."""
+        if not os.path.exists(_ADK_RESULTS_FILE):
+            return {}
+        try:
+            with open(_ADK_RESULTS_FILE, 'rb') as f:
+                data = f.read()
+            previous = orjson.loads(data) if orjson is not None else json.loads(data)
+            return previous.get("validation_results") or {}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _make_model(self, max_tokens: Optional[int] = None) -> LiteLlm:
+        """Create the LLM used by validator agents, with a capped response length."""
+        return LiteLlm(
+            model=f"openai/{self.llm_model}",
+            max_tokens=_HARD_LIMIT_FACTOR * (max_tokens or self.max_response_tokens)
+        )
+
+    def _length_hint(self, max_tokens: Optional[int] = None) -> str:
+        """Instruction suffix asking the agent to respect the response cap."""
+        return f"\n            Keep the response under {max_tokens or self.max_response_tokens} tokens."
+
+    def _validation_cache_key(self, agent_name: str, payload: Any) -> str:
+        """Cache key for an agent response, scoped to the agent and model."""
+        return _cache_key({"agent": agent_name, "model": self.llm_model, "input": payload})
+
+    def _load_cached_result(self, key: str) -> Any:
+        """Return a cached agent result, or None on a cache miss."""
+        path = os.path.join(self.validation_cache_dir, key + ".json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached_result(self, key: str, result: Any) -> None:
+        """Persist an agent result under its cache key."""
+        try:
+            os.makedirs(self.validation_cache_dir, exist_ok=True)
+            _write_bytes(os.path.join(self.validation_cache_dir, key + ".json"), _dumps_json(result))
+        except OSError as e:
+            self.log(f"Could not cache validation result: {e}", "WARNING")
+
+    async def _call_with_retry(self, caller, prompt: str) -> Any:
+        """Call an agent with a timeout, retrying with exponential backoff."""
+        for attempt in range(self.llm_retries + 1):
+            try:
+                return await asyncio.wait_for(caller.call(prompt), timeout=self.llm_timeout)
+            except Exception as e:
+                if attempt == self.llm_retries:
+                    raise
+                self.log(f"Agent call failed ({e!r}), retrying...", "WARNING")
+                await asyncio.sleep(2 ** attempt)
+
+    async def _get_caller(self, name: str, instruction: str, max_tokens: Optional[int] = None):
+        """Create an agent caller for a validator agent."""
         agent = Agent(
+            name=name,
+            model=self._make_model(max_tokens),
+            instruction=instruction + self._length_hint(max_tokens)
+        )
+        return await make_agent_caller(agent)
+
+    async def _normalized_call(self, caller, prompt: str) -> Dict[str, Any]:
+        """
+        Call an agent and return its response as a dict.
+
+        Raises _UnparsableResponse if the agent did not answer with a JSON object.
+        """
+        response = await self._call_with_retry(caller, prompt)
+        if isinstance(response, dict):
+            return response
+        try:
+            parsed = json.loads(response)
+        except (TypeError, ValueError):
+            parsed = None
+        if not isinstance(parsed, dict):
+            raise _UnparsableResponse(response)
+        return parsed
+
+    @staticmethod
+    def _with_defaults(validation: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in the keys every validation result is expected to carry."""
+        if "score" not in validation:
+            validation["score"] = _FALLBACK_SCORE
+            validation["parsed"] = False
+        validation.setdefault("suggestions", [])
+        return validation
+
+    @staticmethod
+    def _is_parsed(validation: Dict[str, Any]) -> bool:
+        """Whether a validation score came from the agent rather than the fallback."""
+        return validation.get("parsed", True)
+
+    async def _run_validator(
+        self,
+        name: str,
+        result_key: str,
+        label: str,
+        instruction: str,
+        prompt: str,
+        cache_payload: Any,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Run a single validator agent, with on-disk caching and a common fallback score."""
+        cache_key = self._validation_cache_key(name, cache_payload)
+        validation = self._load_cached_result(cache_key) if use_cache else None
+
+        if validation is None:
+            try:
+                caller = await self._get_caller(name, instruction)
+                validation = self._with_defaults(await self._normalized_call(caller, prompt))
+            except _UnparsableResponse as e:
+                validation = {"score": _FALLBACK_SCORE, "suggestions": [str(e.response)], "parsed": False}
+            except Exception as e:
+                self.log(f"{label} failed: {e}", "WARNING")
+                return {"score": _FALLBACK_SCORE, "suggestions": [], "parsed": False}
+            else:
+                if self._is_parsed(validation):
+                    self._store_cached_result(cache_key, validation)
+
+        self.validation_results[result_key] = validation
+        self.log(f"{label} score: {validation.get('score', 'N/A')}/100")
+
+        return validation
+
+    async def validate_goal(self, goal: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """Use ADK agent to validate and improve the goal determination."""
+        return await self._run_validator(
             name="goal_validator",
-            model=LiteLlm(model=f"openai/{self.llm_model}"),
+            result_key="goal_validation",
+            label="Goal validation",
             instruction="""You are a knowledge graph design expert. Analyze the proposed goal and provide:
             1. A quality score (0-100)
             2. Suggestions for improvement
             3. Any missing considerations
 
-            Return JSON with: {score, suggestions, improvements}"""
+            Return JSON with: {score, suggestions, improvements}""",
+            prompt=f"Validate this knowledge graph goal:\n{_prompt_json(goal)}",
+            cache_payload=goal,
+            use_cache=use_cache
         )
 
-        try:
-            caller = await make_agent_caller(agent)
-            prompt = f"Validate this knowledge graph goal: {json.dumps(goal)}"
-            response = await caller.call(prompt)
-
-            # Parse response
-            if isinstance(response, str):
-                try:
-                    validation = json.loads(response)
-                except:
-                    validation = {"score": 75, "suggestions": [response]}
-            else:
-                validation = response
-
-            self.validation_results['goal_validation'] = validation
-            self.log(f"Goal validation score: {validation.get('score', 'N/A')}/100")
-
-            return validation
-        except Exception as e:
-            self.log(f"Goal validation failed: {e}", "WARNING")
-            return {"score": 70, "suggestions": []}
-
-    async def validate_file_selection(self, files: Dict[str, Any], goal: Dict[str, Any]) -> Dict[str, Any]:
+    async def validate_file_selection(
+        self,
+        files: Dict[str, Any],
+        goal: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """Validate file selection using ADK agent."""
-        agent = Agent(
+        return await self._run_validator(
             name="file_validator",
-            model=LiteLlm(model=f"openai/{self.llm_model}"),
+            result_key="file_selection_validation",
+            label="File selection",
             instruction="""Analyze if the selected files match the goal. Consider:
             1. Relevance to the goal
             2. Coverage of required entities
             3. Missing data sources
 
-            Return JSON with: {score, relevant_files, missing_data_types, suggestions}"""
+            Return JSON with: {score, relevant_files, missing_data_types, suggestions}""",
+            prompt=f"Goal:\n{_prompt_json(goal)}\nSelected files:\n{_prompt_json(files)}",
+            cache_payload={"files": files, "goal": goal},
+            use_cache=use_cache
         )
 
-        try:
-            caller = await make_agent_caller(agent)
-            prompt = f"Goal: {json.dumps(goal)}\nSelected files: {json.dumps(files)}"
-            response = await caller.call(prompt)
-
-            if isinstance(response, str):
-                try:
-                    validation = json.loads(response)
-                except:
-                    validation = {"score": 80, "suggestions": [response]}
-            else:
-                validation = response
-
-            self.validation_results['file_selection_validation'] = validation
-            self.log(f"File selection score: {validation.get('score', 'N/A')}/100")
-
-            return validation
-        except Exception as e:
-            self.log(f"File validation failed: {e}", "WARNING")
-            return {"score": 75, "suggestions": []}
-
-    async def validate_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+    async def validate_schema(self, schema: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
         """Validate generated schema using ADK agent."""
-        agent = Agent(
+        return await self._run_validator(
             name="schema_validator",
-            model=LiteLlm(model=f"openai/{self.llm_model}"),
+            result_key="schema_validation",
+            label="Schema validation",
             instruction="""Review the schema design. Check for:
             1. Completeness of entity relationships
             2. Proper normalization
             3. Missing relationships
             4. Data quality issues
 
-            Return JSON with: {score, missing_relationships, improvements, warnings}"""
+            Return JSON with: {score, missing_relationships, improvements, warnings}""",
+            prompt=f"Validate this knowledge graph schema:\n{_prompt_json(schema)}",
+            cache_payload=schema,
+            use_cache=use_cache
         )
 
-        try:
-            caller = await make_agent_caller(agent)
-            prompt = f"Validate this knowledge graph schema: {json.dumps(schema)}"
-            response = await caller.call(prompt)
-
-            if isinstance(response, str):
-                try:
-                    validation = json.loads(response)
-                except:
-                    validation = {"score": 85, "suggestions": [response]}
-            else:
-                validation = response
+    async def validate_all(
+        self,
+        goal: Dict[str, Any],
+        files: Dict[str, Any],
+        schema: Dict[str, Any],
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Validate goal, file selection and schema with a single ADK agent call.
 
-            self.validation_results['schema_validation'] = validation
-            self.log(f"Schema validation score: {validation.get('score', 'N/A')}/100")
+        Falls back to the individual validators if the combined response
+        cannot be parsed into all three sections.
+        """
+        cache_key = self._validation_cache_key(
+            "combined_validator", {"goal": goal, "files": files, "schema": schema}
+        )
+        validations = self._load_cached_result(cache_key) if use_cache else None
+        if validations is not None:
+            self.log("Using cached validation results")
+        else:
+            validations = await self._run_combined_validation(goal, files, schema, cache_key)
+            if validations is None:
+                self.log("Combined validation failed, validating separately", "WARNING")
+                goal_validation, file_validation, schema_validation = await asyncio.gather(
+                    self.validate_goal(goal, use_cache),
+                    self.validate_file_selection(files, goal, use_cache),
+                    self.validate_schema(schema, use_cache)
+                )
+                return {
+                    "goal": goal_validation,
+                    "file_selection": file_validation,
+                    "schema": schema_validation,
+                    "improvements": []
+                }
+
+        self.validation_results['goal_validation'] = validations['goal']
+        self.validation_results['file_selection_validation'] = validations['file_selection']
+        self.validation_results['schema_validation'] = validations['schema']
+        self.log(f"Goal validation score: {validations['goal'].get('score', 'N/A')}/100")
+        self.log(f"File selection score: {validations['file_selection'].get('score', 'N/A')}/100")
+        self.log(f"Schema validation score: {validations['schema'].get('score', 'N/A')}/100")
+
+        return validations
+
+    async def _run_combined_validation(
+        self,
+        goal: Dict[str, Any],
+        files: Dict[str, Any],
+        schema: Dict[str, Any],
+        cache_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """Call the combined validator agent; returns None if the response is unusable."""
+        try:
+            caller = await self._get_caller(
+                "combined_validator",
+                """You are a knowledge graph design expert. Review the goal, the selected
+            files and the schema together and score each of them (0-100).
+
+            Return JSON with:
+            {"goal": {score, suggestions, improvements},
+             "file_selection": {score, relevant_files, missing_data_types, suggestions},
+             "schema": {score, missing_relationships, improvements, warnings},
+             "improvements": [actionable improvements]}""",
+                max_tokens=4 * self.max_response_tokens
+            )
+            prompt = (
+                f"Goal:\n{_prompt_json(goal)}\n"
+                f"Selected files:\n{_prompt_json(files)}\n"
+                f"Schema:\n{_prompt_json(schema)}"
+            )
+            validations = await self._normalized_call(caller, prompt)
 
-            return validation
+            if not all(isinstance(validations.get(key), dict) for key in ("goal", "file_selection", "schema")):
+                raise ValueError("combined validation response is missing sections")
         except Exception as e:
-            self.log(f"Schema validation failed: {e}", "WARNING")
-            return {"score": 80, "suggestions": []}
+            self.log(f"Combined validation failed: {e}", "WARNING")
+            return None
+
+        for key in ("goal", "file_selection", "schema"):
+            validations[key] = self._with_defaults(validations[key])
+        validations.setdefault("improvements", [])
 
-    async def suggest_improvements(self, current_state: Dict[str, Any]) -> List[str]:
+        if all(self._is_parsed(validations[key]) for key in ("goal", "file_selection", "schema")):
+            self._store_cached_result(cache_key, validations)
+        return validations
+
+    def _validation_input_keys(
+        self,
+        goal: Dict[str, Any],
+        files: Dict[str, Any],
+        schema: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Cache keys of the inputs each validator scores, matching _run_validator."""
+        return {
+            "goal": self._validation_cache_key("goal_validator", goal),
+            "file_selection": self._validation_cache_key("file_validator", {"files": files, "goal": goal}),
+            "schema": self._validation_cache_key("schema_validator", schema)
+        }
+
+    async def _validate_changed_plans(
+        self,
+        goal: Dict[str, Any],
+        files: Dict[str, Any],
+        schema: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Validate only the plans whose validator inputs changed since the last run.
+
+        A saved score is reused when it was computed from the same inputs, so a
+        file selection loaded from disk is still re-scored after the goal changes.
+        Fallback scores are never reused.
+        """
+        validators = {
+            "goal": lambda: self.validate_goal(goal),
+            "file_selection": lambda: self.validate_file_selection(files, goal),
+            "schema": lambda: self.validate_schema(schema)
+        }
+        input_keys = self._validation_input_keys(goal, files, schema)
+        previous = self._previous_validation_results
+        stale = []
+        for name in validators:
+            saved = previous.get(f"{name}_validation")
+            if not (saved and self._is_parsed(saved) and saved.get("input_key") == input_keys[name]):
+                stale.append(name)
+
+        if len(stale) == len(validators):
+            validations = await self.validate_all(goal, files, schema)
+        else:
+            validations = {}
+            for name in validators:
+                if name not in stale:
+                    validations[name] = previous[f"{name}_validation"]
+                    self.validation_results[f"{name}_validation"] = validations[name]
+                    self.log(f"Reusing previous {name.replace('_', ' ')} validation: "
+                             f"{validations[name].get('score', 'N/A')}/100")
+
+            results = await asyncio.gather(*(validators[name]() for name in stale))
+            validations.update(zip(stale, results))
+
+        # Saved with the results so the next run can tell what each score was computed from
+        for name, key in input_keys.items():
+            validations[name]["input_key"] = key
+        return validations
+
+    async def suggest_improvements(self, current_state: Dict[str, Any], use_cache: bool = True) -> List[str]:
         """Get improvement suggestions from ADK agent."""
-        agent = Agent(
-            name="improvement_advisor",
-            model=LiteLlm(model=f"openai/{self.llm_model}"),
-            instruction="""Analyze the current knowledge graph state and suggest improvements.
+        cache_key = self._validation_cache_key("improvement_advisor", current_state)
+        if use_cache:
+            cached = self._load_cached_result(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            caller = await self._get_caller(
+                "improvement_advisor",
+                """Analyze the current knowledge graph state and suggest improvements.
             Focus on:
             1. Data completeness
             2. Relationship quality
@@ -149,26 +461,28 @@ class ADKDynamicKnowledgeGraphBuilder(DynamicKnowledgeGraphBuilder):
             4. Performance optimization
 
             Return a list of actionable improvements."""
-        )
-
-        try:
-            caller = await make_agent_caller(agent)
-            prompt = f"Suggest improvements for: {json.dumps(current_state)}"
-            response = await caller.call(prompt)
+            )
+            prompt = f"Suggest improvements for:\n{_prompt_json(current_state)}"
+            response = await self._call_with_retry(caller, prompt)
 
             if isinstance(response, list):
-                suggestions = response
+                suggestions = response[:_MAX_SUGGESTIONS]
             elif isinstance(response, str):
-                suggestions = [s.strip() for s in response.split('\n') if s.strip()]
+                # Scan lines lazily so an oversized response is not split in full
+                lines = (m.group().strip() for m in _LINE_RE.finditer(response))
+                suggestions = list(islice((line for line in lines if line), _MAX_SUGGESTIONS))
             else:
                 suggestions = []
 
-            return suggestions[:5]  # Top 5 suggestions
+            if suggestions:
+                self._store_cached_result(cache_key, suggestions)
+            return suggestions
         except Exception as e:
             self.log(f"Improvement suggestions failed: {e}", "WARNING")
             return []
 
-    def get_quality_metrics(self) -> Dict[str, Any]:
+    @_cached_per_graph_version
+    async def get_quality_metrics(self) -> Dict[str, Any]:
         """Calculate quality metrics for the graph."""
         metrics = {
             "quality_score": 0,
@@ -179,15 +493,13 @@ class ADKDynamicKnowledgeGraphBuilder(DynamicKnowledgeGraphBuilder):
         }
 
         try:
-            from src.neo4j_for_adk import graphdb
-
             # Count orphan nodes
             orphan_query = """
             MATCH (n)
             WHERE NOT (n)--()
             RETURN count(n) as orphans
             """
-            result = graphdb.send_query(orphan_query)
+            result = await self._aquery(orphan_query)
             if result['status'] == 'success' and result['query_result']:
                 metrics['orphan_nodes'] = result['query_result'][0].get('orphans', 0)
 
@@ -199,12 +511,12 @@ class ADKDynamicKnowledgeGraphBuilder(DynamicKnowledgeGraphBuilder):
             WITH count(DISTINCT n) as connected_nodes, total_nodes
             RETURN toFloat(connected_nodes) / toFloat(total_nodes) as ratio
             """
-            result = graphdb.send_query(conn_query)
+            result = await self._aquery(conn_query)
             if result['status'] == 'success' and result['query_result']:
                 metrics['connectivity_ratio'] = result['query_result'][0].get('ratio', 0)
 
             # Count types
-            stats = self.get_final_statistics()
+            stats = await self.aget_final_statistics()
             metrics['node_types'] = len(stats.get('nodes_by_label', {}))
             metrics['relationship_types'] = len(stats.get('relationships_by_type', {}))
 
@@ -222,176 +534,220 @@ class ADKDynamicKnowledgeGraphBuilder(DynamicKnowledgeGraphBuilder):
 
         return metrics
 
-    async def build_complete_graph(
+    async def astream(
         self,
         reset: bool = True,
         force_regenerate_plans: bool = False,
         limit_text_files: Optional[int] = None,
         validate_quality: bool = True
-    ) -> Dict[str, Any]:
+    ) -> AsyncIterator[Tuple[str, Any]]:
         """
-        Build complete graph with ADK validation and improvements.
+        Run the ADK pipeline, yielding (event, payload) pairs as each step completes.
+
+        Event names match the keys of the dictionary returned by build_complete_graph,
+        so callers can report progress or stop early without waiting for the full run.
+        Run it inside `async with builder:` so the async Neo4j driver is closed afterwards.
         """
-        start_time = datetime.now()
-        self.execution_log = []
+        self.execution_log = deque(maxlen=_EXECUTION_LOG_SIZE)
         self.generated_plans = {}
         self.validation_results = {}
 
-        results = {
-            "start_time": start_time.isoformat(),
-            "data_directory": self.data_dir
+        self.log("\n" + "🤖 "*20)
+        self.log("ADK-ENHANCED KNOWLEDGE GRAPH PIPELINE")
+        self.log("🤖 "*20 + "\n")
+
+        # Reset if requested
+        if reset:
+            yield "reset", await self.areset_graph(confirm=True)
+
+        # Discover files
+        csv_files, text_files = self.discover_files(use_cache=not force_regenerate_plans)
+        yield "discovered_files", {
+            "csv_count": len(csv_files),
+            "text_count": len(text_files)
         }
 
-        try:
-            self.log("\n" + "🤖 "*20)
-            self.log("ADK-ENHANCED KNOWLEDGE GRAPH PIPELINE")
-            self.log("🤖 "*20 + "\n")
-
-            # Reset if requested
-            if reset:
-                results['reset'] = self.reset_graph(confirm=True)
-
-            # Discover files
-            csv_files, text_files = self.discover_files()
-            results['discovered_files'] = {
-                "csv_count": len(csv_files),
-                "text_count": len(text_files)
-            }
-
-            # Phase 1: Determine goal
-            goal = self.phase1_determine_goal(csv_files, text_files, force_regenerate_plans)
-            results['goal'] = goal
-
-            # ADK Validation: Validate goal
-            if validate_quality:
-                goal_validation = await self.validate_goal(goal)
-                if goal_validation.get('score', 0) < 60:
-                    self.log("⚠️ Low goal quality score. Consider reviewing the goal.", "WARNING")
+        # Phase 1: Determine goal
+        goal = self.phase1_determine_goal(csv_files, text_files, force_regenerate_plans)
+        yield "goal", goal
 
-            # Phase 2: Select files
-            file_selection = self.phase2_select_files(
-                csv_files, text_files, goal, force_regenerate_plans
-            )
-            results['file_selection'] = {
-                "selected_csv": len(file_selection['approved_csv_files']),
-                "selected_text": len(file_selection['approved_text_files'])
-            }
+        # Phase 2: Select files
+        file_selection = self.phase2_select_files(
+            csv_files, text_files, goal, force_regenerate_plans
+        )
+        yield "file_selection", {
+            "selected_csv": len(file_selection['approved_csv_files']),
+            "selected_text": len(file_selection['approved_text_files'])
+        }
 
-            # ADK Validation: Validate file selection
-            if validate_quality:
-                file_validation = await self.validate_file_selection(file_selection, goal)
-                if file_validation.get('score', 0) < 70:
-                    self.log("⚠️ File selection may be incomplete.", "WARNING")
+        # Get selected files
+        selected_csv = file_selection['approved_csv_files']
+        selected_text = file_selection['approved_text_files']
 
-            # Get selected files
-            selected_csv = file_selection['approved_csv_files']
-            selected_text = file_selection['approved_text_files']
+        # Apply text file limit
+        selected_text = self._limit_text_files(selected_text, limit_text_files)
 
-            # Apply text file limit
-            if limit_text_files and len(selected_text) > limit_text_files:
-                selected_text = selected_text[:limit_text_files]
-                self.log(f"ℹ️ Limiting to {limit_text_files} text files")
+        # Phase 3: Generate schema
+        construction_plan, extraction_plan = self.phase3_generate_schema(
+            selected_csv, selected_text, goal, force_regenerate_plans
+        )
+
+        # ADK Validation: validate the regenerated plans, in one call when all changed.
+        # Nothing downstream depends on the scores, so the call runs in the
+        # background while phases 4 and 5 build the graph.
+        validation_task = None
+        if validate_quality:
+            validation_task = asyncio.create_task(self._validate_changed_plans(goal, file_selection, {
+                "construction": construction_plan,
+                "extraction": extraction_plan
+            }))
+
+        try:
+            yield "schema_generation", self._summarize_schema(construction_plan, extraction_plan)
 
-            # Phase 3: Generate schema
-            construction_plan, extraction_plan = self.phase3_generate_schema(
-                selected_csv, selected_text, goal, force_regenerate_plans
+            # Phases 4 and 5: build the domain and subject graphs concurrently
+            domain, subject = await self.build_domain_and_subject_graphs(
+                construction_plan, extraction_plan, selected_text
             )
+            yield "domain", domain
+            if subject is not None:
+                yield "subject", subject
 
-            # ADK Validation: Validate schema
-            if validate_quality:
-                schema_validation = await self.validate_schema({
-                    "construction": construction_plan,
-                    "extraction": extraction_plan
-                })
-                if schema_validation.get('score', 0) < 75:
-                    self.log("⚠️ Schema may need improvements.", "WARNING")
+            if validation_task is not None:
+                validations = await validation_task
 
-            results['schema_generation'] = {
-                "nodes_planned": len([v for v in construction_plan.values() if v.get('construction_type') == 'node']),
-                "relationships_planned": len([v for v in construction_plan.values() if v.get('construction_type') == 'relationship']),
-                "entity_types": len(extraction_plan.get('entity_types', [])),
-                "fact_types": len(extraction_plan.get('fact_types', {}))
-            }
+                goal_validation = validations['goal']
+                yield "goal_validation", goal_validation
+                if goal_validation.get('score', 0) < 60:
+                    self.log("⚠️ Low goal quality score. Consider reviewing the goal.", "WARNING")
 
-            # Phase 4: Build domain graph
-            results['domain'] = self.phase4_build_domain_graph(construction_plan)
+                file_validation = validations['file_selection']
+                yield "file_selection_validation", file_validation
+                if file_validation.get('score', 0) < 70:
+                    self.log("⚠️ File selection may be incomplete.", "WARNING")
 
-            # Phase 5: Build subject graph
-            if selected_text:
-                results['subject'] = await self.phase5_build_subject_graph(
-                    selected_text, extraction_plan
-                )
+                schema_validation = validations['schema']
+                yield "schema_validation", schema_validation
+                if schema_validation.get('score', 0) < 75:
+                    self.log("⚠️ Schema may need improvements.", "WARNING")
+        finally:
+            if validation_task is not None and not validation_task.done():
+                validation_task.cancel()
+
+        # Speculatively request improvement suggestions so the LLM call overlaps
+        # phase 6; the result is only used if the quality score turns out low.
+        # Quality metrics are not known yet, so the advisor works without them.
+        suggestions_task = None
+        if validate_quality:
+            suggestions_task = asyncio.create_task(self.suggest_improvements({
+                "goal": goal,
+                "files": file_selection,
+                "schema": {"construction": construction_plan, "extraction": extraction_plan}
+            }))
 
+        try:
             # Phase 6: Entity resolution
-            results['resolution'] = self.phase6_resolve_entities()
+            yield "resolution", await asyncio.to_thread(self.phase6_resolve_entities)
 
             # Calculate quality metrics
+            quality_metrics = {}
             if validate_quality:
-                quality_metrics = self.get_quality_metrics()
-                results['quality_metrics'] = quality_metrics
+                quality_metrics = await self.get_quality_metrics()
+                yield "quality_metrics", quality_metrics
 
                 self.log(f"\n📊 Graph Quality Score: {quality_metrics['quality_score']}/100")
 
                 # Get improvement suggestions
                 if quality_metrics['quality_score'] < 80:
-                    suggestions = await self.suggest_improvements({
-                        "goal": goal,
-                        "files": file_selection,
-                        "schema": {"construction": construction_plan, "extraction": extraction_plan},
-                        "metrics": quality_metrics
-                    })
+                    suggestions = await suggestions_task
+                    yield "improvement_suggestions", suggestions
 
                     if suggestions:
                         self.log("\n💡 Improvement Suggestions:")
                         for i, suggestion in enumerate(suggestions, 1):
                             self.log(f"  {i}. {suggestion}")
+        finally:
+            if suggestions_task is not None and not suggestions_task.done():
+                suggestions_task.cancel()
 
-            # Save all generated plans
-            self.save_all_plans()
-
-            # Save ADK-specific results
-            adk_results_file = os.path.join("generated_plans", "adk_pipeline_results.json")
-            with open(adk_results_file, 'w') as f:
-                json.dump({
-                    "generated_plans": self.generated_plans,
-                    "validation_results": self.validation_results,
-                    "quality_metrics": results.get('quality_metrics', {}),
-                    "timestamp": datetime.now().isoformat()
-                }, f, indent=2, default=str)
-
-            # Final statistics
-            self.log("\n" + "="*60)
-            self.log("ADK PIPELINE COMPLETE")
-            self.log("="*60)
-
-            stats = self.get_final_statistics()
-            results['final_statistics'] = stats
-
-            self.log(f"\n📊 Final Statistics:")
-            self.log(f"  Nodes: {stats['total_nodes']:,}")
-            self.log(f"  Relationships: {stats['total_relationships']:,}")
-
-            # Execution time
-            end_time = datetime.now()
-            results['execution_time_seconds'] = (end_time - start_time).total_seconds()
-            results['end_time'] = end_time.isoformat()
+        # Save all generated plans
+        self.save_all_plans()
 
-            self.log(f"\n⏱️ Execution time: {results['execution_time_seconds']:.2f} seconds")
-            self.log("\n✅ ADK pipeline completed successfully!")
+        # Save ADK-specific results; fallback scores are left out so the next
+        # run validates those plans again instead of reusing a made-up score
+        parsed_validations = {
+            key: validation for key, validation in self.validation_results.items()
+            if self._is_parsed(validation)
+        }
+        payload = _dumps_json({
+            "generated_plans": self.generated_plans,
+            "validation_results": parsed_validations,
+            "quality_metrics": quality_metrics,
+            "timestamp": datetime.now().isoformat()
+        })
+        await asyncio.to_thread(_write_bytes, _ADK_RESULTS_FILE, payload)
+        self._previous_validation_results = parsed_validations
+
+        # Final statistics
+        self.log("\n" + "="*60)
+        self.log("ADK PIPELINE COMPLETE")
+        self.log("="*60)
+
+        stats = await self.aget_final_statistics()
+        yield "final_statistics", stats
+
+        self.log(f"\n📊 Final Statistics:")
+        self.log(f"  Nodes: {stats['total_nodes']:,}")
+        self.log(f"  Relationships: {stats['total_relationships']:,}")
 
-            results['status'] = 'success'
-            results['validation_results'] = self.validation_results
+    async def build_complete_graph(
+        self,
+        reset: bool = True,
+        force_regenerate_plans: bool = False,
+        limit_text_files: Optional[int] = None,
+        validate_quality: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Build complete graph with ADK validation and improvements.
+        """
+        start_time = datetime.now()
 
-        except Exception as e:
-            self.log(f"\n❌ Pipeline failed: {str(e)}", "ERROR")
-            results['status'] = 'error'
-            results['error'] = str(e)
-            import traceback
-            results['traceback'] = traceback.format_exc()
+        results = {
+            "start_time": start_time.isoformat(),
+            "data_directory": self.data_dir
+        }
 
-        finally:
-            results['execution_log'] = self.execution_log
-            results['generated_plans'] = self.generated_plans
+        async with self:
+            try:
+                async for event, payload in self.astream(
+                    reset=reset,
+                    force_regenerate_plans=force_regenerate_plans,
+                    limit_text_files=limit_text_files,
+                    validate_quality=validate_quality
+                ):
+                    results[event] = payload
+
+                # Execution time
+                end_time = datetime.now()
+                results['execution_time_seconds'] = (end_time - start_time).total_seconds()
+                results['end_time'] = end_time.isoformat()
+
+                self.log(f"\n⏱️ Execution time: {results['execution_time_seconds']:.2f} seconds")
+                self.log("\n✅ ADK pipeline completed successfully!")
+
+                results['status'] = 'success'
+                results['validation_results'] = self.validation_results
+
+            except Exception as e:
+                self.log(f"\n❌ Pipeline failed: {str(e)}", "ERROR")
+                results['status'] = 'error'
+                results['error'] = str(e)
+                import traceback
+                results['traceback'] = traceback.format_exc()
+
+            finally:
+                results['execution_log'] = list(self.execution_log)
+                results['generated_plans'] = self.generated_plans
 
         return results
 
@@ -3,28 +3,190 @@ Dynamic Pipeline Builder
 Orchestrates agents to dynamically generate plans and build knowledge graphs
 """
 
-import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
+import sys
 import asyncio
+import atexit
+import functools
+import inspect
 import json
-from typing import Dict, Any, Optional, List, Tuple
+import logging
+import logging.handlers
+import queue
+import threading
+from collections import Counter, deque
+from itertools import islice
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from datetime import datetime
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Entity types extracted from text when the extraction plan names none, and
+# domain entity types linked across the two graphs during resolution
+_DEFAULT_ENTITY_TYPES = ("Product", "Issue", "Feature", "User")
+_DEFAULT_LINKAGE_TYPES = ("Product", "Supplier", "Part", "Assembly")
+
+# Shared read-only default for optional mappings in agent results
+_EMPTY = MappingProxyType({})
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_DEFAULT_DATA_DIR = os.path.join(_PROJECT_ROOT, "data")
+
+_CSV_SUFFIXES = ('.csv',)
+_TEXT_SUFFIXES = ('.md', '.txt')
+_DISCOVERY_CACHE_FILE = os.path.join("generated_plans", "discovered_files.json")
+
+# Node and relationship counts in a single round trip
+_STATISTICS_QUERY = """
+MATCH (n)
+UNWIND labels(n) AS name
+RETURN 'node' AS kind, name, count(*) AS total
+UNION ALL
+MATCH ()-[r]->()
+RETURN 'relationship' AS kind, type(r) AS name, count(*) AS total
+"""
+
+# Same rows as _STATISTICS_QUERY, read from the counts store instead of a scan
+_APOC_STATISTICS_QUERY = """
+CALL apoc.meta.stats() YIELD labels, relTypesCount
+UNWIND [label IN keys(labels) | {kind: 'node', name: label, total: labels[label]}] +
+       [rel_type IN keys(relTypesCount) | {kind: 'relationship', name: rel_type, total: relTypesCount[rel_type]}] AS row
+RETURN row.kind AS kind, row.name AS name, row.total AS total
+"""
+
+# Entries kept in execution_log; older entries are dropped first. Set KG_LOG_FILE
+# to also append every entry to a file, so nothing is lost past this limit.
+_EXECUTION_LOG_SIZE = int(os.getenv("KG_LOG_MAX", 10000))
+
+_LOG_FORMATTER = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+_logger = logging.getLogger("dyn_kg")
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+def _dumps_json(data: Any) -> bytes:
+    """Serialize data to indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode("utf-8")
 
-# Import dynamic agents
-from src.agents.intent_agent import AutomatedIntentAgent
-from src.agents.file_selection_agent import AutomatedFileSelectionAgent
-from src.agents.schema_agent import AutomatedSchemaAgent
 
-# Import execution agents
-from src.agents.structured_agent import AutomatedStructuredAgent
-from src.agents.unstructured_agent_direct import DirectUnstructuredAgent
-from src.agents.linkage_agent import AutomatedLinkageAgent
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write raw bytes to a file."""
+    with open(path, 'wb') as f:
+        f.write(data)
 
-# Import Neo4j utilities
-from src.neo4j_for_adk import graphdb
-from notebooks.tools import drop_neo4j_indexes, clear_neo4j_data
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that acknowledges flush markers once the records before them are written."""
+
+    def handle(self, record: logging.LogRecord):
+        flushed = getattr(record, "flushed", None)
+        if flushed is None:
+            super().handle(record)
+            return
+        for handler in self.handlers:
+            handler.flush()
+        flushed.set()
+
+
+def _get_logger() -> logging.Logger:
+    """Return the pipeline logger, starting its background console writer on first use."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            log_queue = queue.SimpleQueue()
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(logging.Formatter('%(message)s'))
+            handlers = [console]
+
+            log_file = os.getenv("KG_LOG_FILE")
+            if log_file:
+                file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+                file_handler.setFormatter(_LOG_FORMATTER)
+                handlers.append(file_handler)
+
+            _log_listener = _FlushingQueueListener(log_queue, *handlers)
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+
+            _logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+    return _logger
+
+
+def _flush_log(timeout: float = 5.0) -> None:
+    """
+    Wait until every queued log record has been written.
+
+    The agents print to stdout directly, so this runs before they do to keep
+    their output after the pipeline lines logged ahead of it.
+    """
+    listener = _log_listener
+    if listener is not None:
+        marker = logging.makeLogRecord({"flushed": threading.Event()})
+        listener.queue.put_nowait(marker)
+        marker.flushed.wait(timeout)
+    sys.stdout.flush()
+
+
+def _mutates_graph(method: Callable) -> Callable:
+    """Mark a method as writing to the graph, invalidating cached graph reads."""
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                self._graph_version += 1
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._graph_version += 1
+    return wrapper
+
+
+def _cached_per_graph_version(method: Callable = None, *, key: str = None) -> Callable:
+    """
+    Cache a graph read until the next method decorated with _mutates_graph runs.
+
+    Methods given the same key share one cache entry, so the sync and async
+    versions of a read do not query the graph twice.
+    """
+    if method is None:
+        return functools.partial(_cached_per_graph_version, key=key)
+    cache_key = key or method.__name__
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            cached = self._graph_cache.get(cache_key)
+            if cached is not None and cached[0] == self._graph_version:
+                return cached[1]
+            version = self._graph_version
+            result = await method(self, *args, **kwargs)
+            self._graph_cache[cache_key] = (version, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cached = self._graph_cache.get(cache_key)
+        if cached is not None and cached[0] == self._graph_version:
+            return cached[1]
+        result = method(self, *args, **kwargs)
+        self._graph_cache[cache_key] = (self._graph_version, result)
+        return result
+    return wrapper
 
 
 class DynamicKnowledgeGraphBuilder:
@@ -33,6 +195,22 @@ class DynamicKnowledgeGraphBuilder:
     No hardcoded plans - everything is determined at runtime.
     """
 
+    __slots__ = (
+        "intent_agent",
+        "file_selection_agent",
+        "schema_agent",
+        "structured_agent",
+        "unstructured_agent",
+        "linkage_agent",
+        "data_dir",
+        "execution_log",
+        "generated_plans",
+        "_graph_version",
+        "_graph_cache",
+        "_async_driver",
+        "_apoc_available"
+    )
+
     def __init__(self, data_dir: str = None):
         """
         Initialize the dynamic builder.
@@ -40,6 +218,15 @@ class DynamicKnowledgeGraphBuilder:
         Args:
             data_dir: Directory containing data files (uses default if not provided)
         """
+        # Agents are imported here rather than at module level so that importing
+        # this module stays cheap for processes that never build a graph
+        from src.agents.intent_agent import AutomatedIntentAgent
+        from src.agents.file_selection_agent import AutomatedFileSelectionAgent
+        from src.agents.schema_agent import AutomatedSchemaAgent
+        from src.agents.structured_agent import AutomatedStructuredAgent
+        from src.agents.unstructured_agent_direct import DirectUnstructuredAgent
+        from src.agents.linkage_agent import AutomatedLinkageAgent
+
         # Planning agents
         self.intent_agent = AutomatedIntentAgent()
         self.file_selection_agent = AutomatedFileSelectionAgent()
@@ -50,47 +237,114 @@ class DynamicKnowledgeGraphBuilder:
         self.unstructured_agent = DirectUnstructuredAgent()
         self.linkage_agent = AutomatedLinkageAgent()
 
-        # Data directory
-        if data_dir:
-            self.data_dir = data_dir
-        else:
-            # Default to project data directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(current_dir))
-            self.data_dir = os.path.join(project_root, "data")
+        # Data directory (defaults to the project data directory)
+        self.data_dir = data_dir or _DEFAULT_DATA_DIR
 
         # Execution tracking
-        self.execution_log = []
+        self.execution_log = deque(maxlen=_EXECUTION_LOG_SIZE)
         self.generated_plans = {}
 
+        # Cached graph reads, invalidated whenever a phase writes to the graph
+        self._graph_version = 0
+        self._graph_cache = {}
+
+        # Async Neo4j driver, created on first use and closed by aclose()
+        self._async_driver = None
+
+        # Whether the server has APOC; None until the first statistics query
+        self._apoc_available = None
+
     def log(self, message: str, level: str = "INFO"):
-        """Log a message with timestamp."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}"
-        self.execution_log.append(log_entry)
-        print(message)
-
-    def discover_files(self) -> Tuple[List[str], List[str]]:
-        """Discover available CSV and text files in the data directory."""
+        """Log a message with timestamp; console output is written by a background thread."""
+        logger = _get_logger()
+        levelno = logging.getLevelName(level)
+        record = logger.makeRecord(
+            logger.name, levelno if isinstance(levelno, int) else logging.INFO,
+            __file__, 0, message, None, None
+        )
+        self.execution_log.append(_LOG_FORMATTER.format(record))
+        logger.handle(record)
+
+    def discover_files(self, use_cache: bool = True) -> Tuple[List[str], List[str]]:
+        """
+        Discover available CSV and text files in the data directory.
+
+        The result is cached with the mtime of every scanned directory; the scan is
+        skipped while none of them has changed.
+        """
         self.log("🔍 Discovering available files...")
 
+        cached = self._load_discovered_files() if use_cache else None
+        if cached is not None:
+            csv_files, text_files = cached
+            self.log(f"  Using cached discovery: {len(csv_files)} CSV files and {len(text_files)} text files")
+            return csv_files, text_files
+
         csv_files = []
         text_files = []
-
-        # Walk through data directory
-        for root, dirs, files in os.walk(self.data_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, self.data_dir)
-
-                if file.lower().endswith('.csv'):
-                    csv_files.append(file_path)
-                elif file.lower().endswith(('.md', '.txt')):
-                    text_files.append(file_path)
+        directories = {self.data_dir: os.stat(self.data_dir).st_mtime_ns}
+
+        # Scan directories with an explicit stack; DirEntry already carries the
+        # name, path and file type, so no extra stat or path join per file
+        stack = [self.data_dir]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        directories[entry.path] = entry.stat(follow_symlinks=False).st_mtime_ns
+                    elif entry.is_file():
+                        name = entry.name.lower()
+                        if name.endswith(_CSV_SUFFIXES):
+                            csv_files.append(entry.path)
+                        elif name.endswith(_TEXT_SUFFIXES):
+                            text_files.append(entry.path)
+
+        self._save_discovered_files(csv_files, text_files, directories)
 
         self.log(f"  Found {len(csv_files)} CSV files and {len(text_files)} text files")
         return csv_files, text_files
 
+    def _load_discovered_files(self) -> Optional[Tuple[List[str], List[str]]]:
+        """Return the cached file lists if no scanned directory has changed since."""
+        try:
+            with open(_DISCOVERY_CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if cached.get("data_dir") != self.data_dir:
+            return None
+
+        try:
+            for path, mtime_ns in cached["directories"].items():
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return None
+        except (OSError, KeyError, AttributeError):
+            return None
+
+        return cached.get("csv_files", []), cached.get("text_files", [])
+
+    def _save_discovered_files(
+        self,
+        csv_files: List[str],
+        text_files: List[str],
+        directories: Dict[str, int]
+    ):
+        """Save discovered file lists with the directory mtimes they were read at."""
+        try:
+            os.makedirs(os.path.dirname(_DISCOVERY_CACHE_FILE), exist_ok=True)
+            with open(_DISCOVERY_CACHE_FILE, 'w') as f:
+                json.dump({
+                    "data_dir": self.data_dir,
+                    "directories": directories,
+                    "csv_files": csv_files,
+                    "text_files": text_files
+                }, f, indent=2)
+        except OSError as e:
+            self.log(f"  Could not cache discovered files: {e}", "WARNING")
+
+    @_mutates_graph
     def reset_graph(self, confirm: bool = False) -> Dict[str, Any]:
         """Reset the Neo4j graph database."""
         if not confirm:
@@ -99,6 +353,8 @@ class DynamicKnowledgeGraphBuilder:
                 "message": "Reset requires confirmation. Set confirm=True to proceed."
             }
 
+        from notebooks.tools import drop_neo4j_indexes, clear_neo4j_data
+
         self.log("🔄 Resetting Neo4j graph...")
 
         # Drop indexes
@@ -115,6 +371,79 @@ class DynamicKnowledgeGraphBuilder:
             "data_cleared": clear_result['status']
         }
 
+    @_mutates_graph
+    async def areset_graph(self, confirm: bool = False) -> Dict[str, Any]:
+        """Reset the Neo4j graph database without blocking the event loop."""
+        if not confirm:
+            return {
+                "status": "error",
+                "message": "Reset requires confirmation. Set confirm=True to proceed."
+            }
+
+        from notebooks.tools import adrop_neo4j_indexes, aclear_neo4j_data
+
+        self.log("🔄 Resetting Neo4j graph...")
+        driver = self._get_async_driver()
+
+        # Drop indexes
+        drop_result = await adrop_neo4j_indexes(driver)
+        self.log(f"  Indexes dropped: {drop_result['status']}")
+
+        # Clear data
+        clear_result = await aclear_neo4j_data(driver)
+        self.log(f"  Data cleared: {clear_result['status']}")
+
+        return {
+            "status": "success",
+            "indexes_dropped": drop_result['status'],
+            "data_cleared": clear_result['status']
+        }
+
+    def _get_async_driver(self):
+        """Return the builder's async Neo4j driver, creating it on first use."""
+        if self._async_driver is None:
+            from src.neo4j_for_adk import graphdb
+            self._async_driver = graphdb.create_async_driver()
+        return self._async_driver
+
+    async def _aquery(self, cypher_query: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run a query on the async driver; returns the same shape as graphdb.send_query."""
+        from src.neo4j_for_adk import graphdb
+        return await graphdb.asend_query(self._get_async_driver(), cypher_query, parameters)
+
+    async def aclose(self):
+        """Close the async Neo4j driver if one was opened."""
+        if self._async_driver is not None:
+            await self._async_driver.close()
+            self._async_driver = None
+
+    async def __aenter__(self) -> "DynamicKnowledgeGraphBuilder":
+        """Open the async Neo4j driver shared by every phase of a run."""
+        self._get_async_driver()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def _limit_text_files(self, text_files: List[str], limit: Optional[int]) -> List[str]:
+        """
+        Return at most `limit` text files.
+
+        The list is only copied when it is actually over the limit; the approved
+        file selection itself is left untouched since it is saved with the plans.
+        """
+        if not limit or len(text_files) <= limit:
+            return text_files
+        self.log(f"ℹ️ Limiting to {limit} text files")
+        return text_files[:limit]
+
+    def _log_phase(self, title: str):
+        """Log a phase banner and flush it before the phase's agents start printing."""
+        self.log("\n" + "="*60)
+        self.log(title)
+        self.log("="*60)
+        _flush_log()
+
     def phase1_determine_goal(
         self,
         csv_files: List[str],
@@ -122,9 +451,7 @@ class DynamicKnowledgeGraphBuilder:
         force_regenerate: bool = False
     ) -> Dict[str, Any]:
         """Phase 1: Determine the knowledge graph goal."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 1: GOAL DETERMINATION")
-        self.log("="*60)
+        self._log_phase("PHASE 1: GOAL DETERMINATION")
 
         goal = self.intent_agent.load_or_generate_goal(
             csv_files,
@@ -143,9 +470,7 @@ class DynamicKnowledgeGraphBuilder:
         force_reselect: bool = False
     ) -> Dict[str, Any]:
         """Phase 2: Select relevant files based on goal."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 2: FILE SELECTION")
-        self.log("="*60)
+        self._log_phase("PHASE 2: FILE SELECTION")
 
         selection = self.file_selection_agent.load_or_select_files(
             csv_files,
@@ -166,9 +491,7 @@ class DynamicKnowledgeGraphBuilder:
         force_regenerate: bool = False
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Phase 3: Generate schema and construction plans."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 3: SCHEMA GENERATION")
-        self.log("="*60)
+        self._log_phase("PHASE 3: SCHEMA GENERATION")
 
         construction_plan, extraction_plan = self.schema_agent.load_or_generate_plans(
             csv_files,
@@ -182,11 +505,57 @@ class DynamicKnowledgeGraphBuilder:
 
         return construction_plan, extraction_plan
 
+    @staticmethod
+    def _summarize_schema(construction_plan: Dict[str, Any], extraction_plan: Dict[str, Any]) -> Dict[str, int]:
+        """Count planned nodes, relationships, entity types and fact types."""
+        construction_types = Counter(v.get('construction_type') for v in construction_plan.values())
+        return {
+            "nodes_planned": construction_types['node'],
+            "relationships_planned": construction_types['relationship'],
+            "entity_types": len(extraction_plan.get('entity_types', ())),
+            "fact_types": len(extraction_plan.get('fact_types', ()))
+        }
+
+    def _ensure_indexes(self, construction_plan: Dict[str, Any]):
+        """
+        Create the constraints and indexes the domain graph MERGEs rely on.
+
+        reset_graph drops every index, so without this each MERGE and relationship
+        MATCH would scan all nodes of its label.
+        """
+        unique_keys = set()
+        lookup_keys = set()
+        for construction in construction_plan.values():
+            construction_type = construction.get('construction_type')
+            if construction_type == 'node':
+                unique_keys.add((construction.get('label'), construction.get('unique_column_name')))
+            elif construction_type == 'relationship':
+                lookup_keys.add((construction.get('from_node_label'), construction.get('from_node_column')))
+                lookup_keys.add((construction.get('to_node_label'), construction.get('to_node_column')))
+
+        # A uniqueness constraint is already backed by an index; incomplete
+        # plan entries are left for construct_domain_graph to report
+        lookup_keys -= unique_keys
+        unique_keys = {(label, key) for label, key in unique_keys if label and key}
+        lookup_keys = {(label, key) for label, key in lookup_keys if label and key}
+
+        for label, key in sorted(unique_keys):
+            result = self.structured_agent.create_uniqueness_constraint(label, key)
+            if result['status'] == 'error':
+                self.log(f"⚠️ Could not create constraint on {label}.{key}: {result['error_message']}", "WARNING")
+
+        for label, key in sorted(lookup_keys):
+            result = self.structured_agent.create_lookup_index(label, key)
+            if result['status'] == 'error':
+                self.log(f"⚠️ Could not create index on {label}.{key}: {result['error_message']}", "WARNING")
+
+    @_mutates_graph
     def phase4_build_domain_graph(self, construction_plan: Dict[str, Any]) -> Dict[str, Any]:
         """Phase 4: Build the domain graph from CSV files."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 4: DOMAIN GRAPH CONSTRUCTION")
-        self.log("="*60)
+        self._log_phase("PHASE 4: DOMAIN GRAPH CONSTRUCTION")
+
+        self._ensure_indexes(construction_plan)
+        _flush_log()
 
         results = self.structured_agent.construct_domain_graph(construction_plan)
 
@@ -196,27 +565,49 @@ class DynamicKnowledgeGraphBuilder:
         if results['relationships_created']:
             self.log(f"✅ Relationships created: {', '.join(results['relationships_created'])}")
 
-        if results.get('statistics'):
-            self.log("\n📊 Domain Graph Statistics:")
-            for label, count in results['statistics'].get('nodes', {}).items():
-                self.log(f"  {label}: {count} nodes")
-            for rel_type, count in results['statistics'].get('relationships', {}).items():
-                self.log(f"  {rel_type}: {count} relationships")
+        statistics = results.get('statistics')
+        if statistics:
+            lines = ["\n📊 Domain Graph Statistics:"]
+            lines.extend(f"  {label}: {count} nodes" for label, count in (statistics.get('nodes') or _EMPTY).items())
+            lines.extend(
+                f"  {rel_type}: {count} relationships"
+                for rel_type, count in (statistics.get('relationships') or _EMPTY).items()
+            )
+            self.log("\n".join(lines))
 
         return results
 
+    async def phase4_build_domain_graph_async(
+        self,
+        construction_plan: Dict[str, Any],
+        done: Optional[asyncio.Event] = None
+    ) -> Dict[str, Any]:
+        """Run phase 4 in a worker thread, setting `done` once it has finished."""
+        try:
+            return await asyncio.to_thread(self.phase4_build_domain_graph, construction_plan)
+        finally:
+            if done is not None:
+                done.set()
+
+    @_mutates_graph
     async def phase5_build_subject_graph(
         self,
         text_files: List[str],
-        extraction_plan: Dict[str, Any]
+        extraction_plan: Dict[str, Any],
+        write_gate: Optional[asyncio.Event] = None,
+        concurrency: int = 8
     ) -> Dict[str, Any]:
-        """Phase 5: Build the subject graph from text files."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 5: SUBJECT GRAPH CONSTRUCTION")
-        self.log("="*60)
+        """
+        Phase 5: Build the subject graph from text files.
+
+        Up to `concurrency` files are extracted at once. Text extraction starts
+        immediately; if write_gate is given, graph writes wait for it so that
+        extracted products link to the domain Product nodes.
+        """
+        self._log_phase("PHASE 5: SUBJECT GRAPH CONSTRUCTION")
 
         # Extract entity types and fact types from plan
-        entity_types = extraction_plan.get("entity_types", ["Product", "Issue", "Feature", "User"])
+        entity_types = extraction_plan.get("entity_types", _DEFAULT_ENTITY_TYPES)
         fact_types = extraction_plan.get("fact_types", {})
 
         # Build the graph
@@ -224,7 +615,9 @@ class DynamicKnowledgeGraphBuilder:
             file_paths=text_files,
             entity_types=entity_types,
             fact_types=fact_types,
-            import_dir=None  # Files already have full paths
+            import_dir=None,  # Files already have full paths
+            write_gate=write_gate,
+            concurrency=concurrency
         )
 
         # Log results
@@ -232,21 +625,53 @@ class DynamicKnowledgeGraphBuilder:
         if results['files_failed']:
             self.log(f"⚠️ Files failed: {len(results['files_failed'])}", "WARNING")
 
-        if results.get('entities_by_type'):
-            self.log("\n📊 Entity Statistics:")
-            for entity_type, count in results['entities_by_type'].items():
-                self.log(f"  {entity_type}: {count} entities")
+        lines = []
+        entities_by_type = results.get('entities_by_type')
+        if entities_by_type:
+            lines.append("\n📊 Entity Statistics:")
+            lines.extend(f"  {entity_type}: {count} entities" for entity_type, count in entities_by_type.items())
 
-        self.log(f"  Chunks created: {results.get('chunk_count', 0)}")
-        self.log(f"  Documents created: {results.get('document_count', 0)}")
+        lines.append(f"  Chunks created: {results.get('chunk_count', 0)}")
+        lines.append(f"  Documents created: {results.get('document_count', 0)}")
+        self.log("\n".join(lines))
 
         return results
 
+    async def build_domain_and_subject_graphs(
+        self,
+        construction_plan: Dict[str, Any],
+        extraction_plan: Dict[str, Any],
+        text_files: List[str]
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Run phases 4 and 5 concurrently.
+
+        Phase 5 extracts entities while the domain graph is loading and holds its
+        writes until phase 4 is done. Returns (domain_results, subject_results);
+        subject_results is None when there are no text files.
+        """
+        domain_built = asyncio.Event()
+        domain_task = asyncio.create_task(
+            self.phase4_build_domain_graph_async(construction_plan, done=domain_built)
+        )
+        if not text_files:
+            return await domain_task, None
+
+        subject_task = asyncio.create_task(
+            self.phase5_build_subject_graph(text_files, extraction_plan, write_gate=domain_built)
+        )
+        try:
+            domain_results, subject_results = await asyncio.gather(domain_task, subject_task)
+        finally:
+            for task in (domain_task, subject_task):
+                if not task.done():
+                    task.cancel()
+        return domain_results, subject_results
+
+    @_mutates_graph
     def phase6_resolve_entities(self, entity_types: List[str] = None) -> Dict[str, Any]:
         """Phase 6: Resolve entities between graphs."""
-        self.log("\n" + "="*60)
-        self.log("PHASE 6: ENTITY RESOLUTION")
-        self.log("="*60)
+        self._log_phase("PHASE 6: ENTITY RESOLUTION")
 
         # Remove existing correspondences
         self.linkage_agent.remove_existing_correspondences()
@@ -254,18 +679,19 @@ class DynamicKnowledgeGraphBuilder:
         # Use entity types from extraction plan if available
         if entity_types is None and "extraction_plan" in self.generated_plans:
             # Get domain entities that might appear in both graphs
-            entity_types = ["Product", "Supplier", "Part", "Assembly"]
+            entity_types = _DEFAULT_LINKAGE_TYPES
 
         # Perform resolution
-        results = self.linkage_agent.resolve_all_entities(entity_types=entity_types)
+        results = self.linkage_agent.resolve_all_entities(entity_types=entity_types, batch_size=5000)
 
         # Log results
         self.log(f"✅ Total relationships created: {results['total_relationships']}")
 
-        if results.get('entities_resolved'):
-            self.log("\n📊 Resolution by Type:")
-            for entity_type, count in results['entities_resolved'].items():
-                self.log(f"  {entity_type}: {count} correspondences")
+        entities_resolved = results.get('entities_resolved')
+        if entities_resolved:
+            lines = ["\n📊 Resolution by Type:"]
+            lines.extend(f"  {entity_type}: {count} correspondences" for entity_type, count in entities_resolved.items())
+            self.log("\n".join(lines))
 
         return results
 
@@ -275,48 +701,68 @@ class DynamicKnowledgeGraphBuilder:
 
         output_file = os.path.join(output_dir, "all_generated_plans.json")
 
-        with open(output_file, 'w') as f:
-            json.dump(self.generated_plans, f, indent=2, default=str)
+        _write_bytes(output_file, _dumps_json(self.generated_plans))
 
         self.log(f"💾 All plans saved to: {output_file}")
         return output_file
 
+    @_cached_per_graph_version(key="final_statistics")
     def get_final_statistics(self) -> Dict[str, Any]:
-        """Get final statistics about the constructed graph."""
-        stats_query = """
-        MATCH (n)
-        WITH labels(n) as node_labels, count(n) as node_count
-        UNWIND node_labels as label
-        WITH label, sum(node_count) as total
-        RETURN label, total
-        ORDER BY total DESC
         """
+        Get final statistics about the constructed graph.
 
-        result = graphdb.send_query(stats_query)
-
-        stats = {"nodes_by_label": {}, "total_nodes": 0}
-
-        if result['status'] == 'success':
-            for row in result['query_result']:
-                stats["nodes_by_label"][row['label']] = row['total']
-                stats["total_nodes"] += row['total']
-
-        # Count relationships
-        rel_query = """
-        MATCH ()-[r]->()
-        RETURN type(r) as type, count(r) as count
-        ORDER BY count DESC
+        Counts come from the counts store via apoc.meta.stats when APOC is
+        installed, falling back to counting every node and relationship.
         """
+        from src.neo4j_for_adk import graphdb
+        if self._apoc_available is not False:
+            result = graphdb.send_query(_APOC_STATISTICS_QUERY)
+            if self._note_apoc_result(result):
+                return self._parse_statistics(result)
+        return self._parse_statistics(graphdb.send_query(_STATISTICS_QUERY))
+
+    @_cached_per_graph_version(key="final_statistics")
+    async def aget_final_statistics(self) -> Dict[str, Any]:
+        """Async version of get_final_statistics."""
+        if self._apoc_available is not False:
+            result = await self._aquery(_APOC_STATISTICS_QUERY)
+            if self._note_apoc_result(result):
+                return self._parse_statistics(result)
+        return self._parse_statistics(await self._aquery(_STATISTICS_QUERY))
+
+    def _note_apoc_result(self, result: Dict[str, Any]) -> bool:
+        """
+        Record whether the APOC statistics query worked; returns whether it did.
 
-        rel_result = graphdb.send_query(rel_query)
-
-        stats["relationships_by_type"] = {}
-        stats["total_relationships"] = 0
+        Only an error naming APOC marks it unavailable, so later calls go straight
+        to the counting query instead of failing the APOC query every time.
+        """
+        if result['status'] == 'success':
+            self._apoc_available = True
+            return True
+        if 'apoc' in str(result.get('error_message', '')).lower():
+            self._apoc_available = False
+        return False
+
+    @staticmethod
+    def _parse_statistics(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Split the rows of a statistics query into node and relationship counts."""
+        stats = {
+            "nodes_by_label": {},
+            "total_nodes": 0,
+            "relationships_by_type": {},
+            "total_relationships": 0
+        }
 
-        if rel_result['status'] == 'success':
-            for row in rel_result['query_result']:
-                stats["relationships_by_type"][row['type']] = row['count']
-                stats["total_relationships"] += row['count']
+        if result['status'] == 'success':
+            rows = sorted(result['query_result'], key=lambda row: row['total'], reverse=True)
+            for row in rows:
+                if row['kind'] == 'node':
+                    stats["nodes_by_label"][row['name']] = row['total']
+                    stats["total_nodes"] += row['total']
+                else:
+                    stats["relationships_by_type"][row['name']] = row['total']
+                    stats["total_relationships"] += row['total']
 
         return stats
 
@@ -338,7 +784,7 @@ class DynamicKnowledgeGraphBuilder:
             Dictionary with complete build results
         """
         start_time = datetime.now()
-        self.execution_log = []
+        self.execution_log = deque(maxlen=_EXECUTION_LOG_SIZE)
         self.generated_plans = {}
 
         results = {
@@ -346,117 +792,113 @@ class DynamicKnowledgeGraphBuilder:
             "data_directory": self.data_dir
         }
 
-        try:
-            self.log("\n" + "🚀 "*20)
-            self.log("DYNAMIC KNOWLEDGE GRAPH PIPELINE")
-            self.log("🚀 "*20 + "\n")
-
-            # Reset if requested
-            if reset:
-                results['reset'] = self.reset_graph(confirm=True)
-
-            # Discover files
-            csv_files, text_files = self.discover_files()
-            results['discovered_files'] = {
-                "csv_count": len(csv_files),
-                "text_count": len(text_files)
-            }
-
-            # Phase 1: Determine goal
-            goal = self.phase1_determine_goal(
-                csv_files,
-                text_files,
-                force_regenerate=force_regenerate_plans
-            )
-            results['goal'] = goal
-
-            # Phase 2: Select files
-            file_selection = self.phase2_select_files(
-                csv_files,
-                text_files,
-                goal,
-                force_reselect=force_regenerate_plans
-            )
-            results['file_selection'] = {
-                "selected_csv": len(file_selection['approved_csv_files']),
-                "selected_text": len(file_selection['approved_text_files'])
-            }
+        async with self:
+            try:
+                self.log("\n" + "🚀 "*20)
+                self.log("DYNAMIC KNOWLEDGE GRAPH PIPELINE")
+                self.log("🚀 "*20 + "\n")
+
+                # Reset if requested
+                if reset:
+                    results['reset'] = await self.areset_graph(confirm=True)
+
+                # Discover files
+                csv_files, text_files = self.discover_files(use_cache=not force_regenerate_plans)
+                results['discovered_files'] = {
+                    "csv_count": len(csv_files),
+                    "text_count": len(text_files)
+                }
+
+                # Phase 1: Determine goal
+                goal = self.phase1_determine_goal(
+                    csv_files,
+                    text_files,
+                    force_regenerate=force_regenerate_plans
+                )
+                results['goal'] = goal
+
+                # Phase 2: Select files
+                file_selection = self.phase2_select_files(
+                    csv_files,
+                    text_files,
+                    goal,
+                    force_reselect=force_regenerate_plans
+                )
+                results['file_selection'] = {
+                    "selected_csv": len(file_selection['approved_csv_files']),
+                    "selected_text": len(file_selection['approved_text_files'])
+                }
 
-            # Get selected files
-            selected_csv = file_selection['approved_csv_files']
-            selected_text = file_selection['approved_text_files']
-
-            # Apply text file limit if specified
-            if limit_text_files and len(selected_text) > limit_text_files:
-                selected_text = selected_text[:limit_text_files]
-                self.log(f"ℹ️ Limiting to {limit_text_files} text files")
-
-            # Phase 3: Generate schema
-            construction_plan, extraction_plan = self.phase3_generate_schema(
-                selected_csv,
-                selected_text,
-                goal,
-                force_regenerate=force_regenerate_plans
-            )
-            results['schema_generation'] = {
-                "nodes_planned": len([v for v in construction_plan.values() if v.get('construction_type') == 'node']),
-                "relationships_planned": len([v for v in construction_plan.values() if v.get('construction_type') == 'relationship']),
-                "entity_types": len(extraction_plan.get('entity_types', [])),
-                "fact_types": len(extraction_plan.get('fact_types', {}))
-            }
+                # Get selected files
+                selected_csv = file_selection['approved_csv_files']
+                selected_text = file_selection['approved_text_files']
 
-            # Phase 4: Build domain graph
-            results['domain'] = self.phase4_build_domain_graph(construction_plan)
+                # Apply text file limit if specified
+                selected_text = self._limit_text_files(selected_text, limit_text_files)
 
-            # Phase 5: Build subject graph
-            if selected_text:
-                results['subject'] = await self.phase5_build_subject_graph(
+                # Phase 3: Generate schema
+                construction_plan, extraction_plan = self.phase3_generate_schema(
+                    selected_csv,
                     selected_text,
-                    extraction_plan
+                    goal,
+                    force_regenerate=force_regenerate_plans
                 )
+                results['schema_generation'] = self._summarize_schema(construction_plan, extraction_plan)
 
-            # Phase 6: Entity resolution
-            results['resolution'] = self.phase6_resolve_entities()
-
-            # Save all generated plans
-            self.save_all_plans()
-
-            # Final Statistics
-            self.log("\n" + "="*60)
-            self.log("KNOWLEDGE GRAPH CONSTRUCTION COMPLETE")
-            self.log("="*60)
-
-            stats = self.get_final_statistics()
-            results['final_statistics'] = stats
-
-            self.log("\n📊 Final Graph Statistics:")
-            self.log(f"  Total Nodes: {stats['total_nodes']:,}")
-            self.log(f"  Total Relationships: {stats['total_relationships']:,}")
-
-            for label, count in list(stats['nodes_by_label'].items())[:10]:
-                self.log(f"    {label:20} {count:8,} nodes")
+                # Phases 4 and 5: build the domain and subject graphs concurrently
+                domain, subject = await self.build_domain_and_subject_graphs(
+                    construction_plan, extraction_plan, selected_text
+                )
+                results['domain'] = domain
+                if subject is not None:
+                    results['subject'] = subject
+
+                # Phase 6: Entity resolution
+                results['resolution'] = await asyncio.to_thread(self.phase6_resolve_entities)
+
+                # Save all generated plans
+                self.save_all_plans()
+
+                # Final Statistics
+                self.log("\n" + "="*60)
+                self.log("KNOWLEDGE GRAPH CONSTRUCTION COMPLETE")
+                self.log("="*60)
+
+                stats = await self.aget_final_statistics()
+                results['final_statistics'] = stats
+
+                lines = [
+                    "\n📊 Final Graph Statistics:",
+                    f"  Total Nodes: {stats['total_nodes']:,}",
+                    f"  Total Relationships: {stats['total_relationships']:,}"
+                ]
+                lines.extend(
+                    f"    {label:20} {count:8,} nodes"
+                    for label, count in islice(stats['nodes_by_label'].items(), 10)
+                )
+                self.log("\n".join(lines))
 
-            # Calculate execution time
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
-            results['execution_time_seconds'] = execution_time
-            results['end_time'] = end_time.isoformat()
+                # Calculate execution time
+                end_time = datetime.now()
+                execution_time = (end_time - start_time).total_seconds()
+                results['execution_time_seconds'] = execution_time
+                results['end_time'] = end_time.isoformat()
 
-            self.log(f"\n⏱️ Execution time: {execution_time:.2f} seconds")
-            self.log("\n✅ Dynamic pipeline execution completed successfully!")
+                self.log(f"\n⏱️ Execution time: {execution_time:.2f} seconds")
+                self.log("\n✅ Dynamic pipeline execution completed successfully!")
 
-            results['status'] = 'success'
+                results['status'] = 'success'
 
-        except Exception as e:
-            self.log(f"\n❌ Pipeline failed: {str(e)}", "ERROR")
-            results['status'] = 'error'
-            results['error'] = str(e)
-            import traceback
-            results['traceback'] = traceback.format_exc()
+            except Exception as e:
+                self.log(f"\n❌ Pipeline failed: {str(e)}", "ERROR")
+                results['status'] = 'error'
+                results['error'] = str(e)
+                import traceback
+                results['traceback'] = traceback.format_exc()
 
-        finally:
-            results['execution_log'] = self.execution_log
-            results['generated_plans'] = self.generated_plans
+            finally:
+                results['execution_log'] = list(self.execution_log)
+                results['generated_plans'] = self.generated_plans
 
         return results
 